@@ -23,8 +23,8 @@ def _load_json(path: Path) -> dict | list:
     """Load JSON file if it exists."""
     if not path.exists():
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # One read_bytes call; json.loads detects the UTF-8 encoding itself
+    return json.loads(path.read_bytes())
 
 
 def load_server_config() -> ServerConfig:
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class PIIMatch:
     """Represents a detected PII match in text."""
     text: str       # original text found
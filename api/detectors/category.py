@@ -7,9 +7,21 @@ Each category maps to a list of words to detect.
 import re
 from typing import Optional
 
+import ahocorasick
+
 from api.detectors.base import PIIMatch
 
 
+def _is_word_char(char: str) -> bool:
+    """Check if char is a regex word character (Unicode \\w)."""
+    return char.isalnum() or char == "_"
+
+
+def _is_hebrew_letter(char: str) -> bool:
+    """Check if char is a Hebrew letter (א-ת)."""
+    return "א" <= char <= "ת"
+
+
 class CategoryDetector:
     """Detector that finds words from category-based word lists."""
 
@@ -26,31 +38,46 @@ class CategoryDetector:
         self._build_patterns()
 
     def _build_patterns(self) -> None:
-        """Build regex patterns for each word in categories."""
+        """Index every word in categories in one Aho-Corasick automaton."""
         self.word_to_category: dict[str, str] = {}
-        self.patterns: list[tuple[re.Pattern, str, str]] = []
+        self._automaton: Optional[ahocorasick.Automaton] = None
 
+        # Word -> (index, category) of every entry with that word
+        entries: dict[str, list[tuple[int, str]]] = {}
+        index = 0
         for category, words in self.categories.items():
             for word in words:
                 # Store word -> category mapping
                 self.word_to_category[word] = category
-
-                # Build pattern with word boundaries
-                # For Hebrew, use lookbehind/lookahead for Hebrew chars
-                # For numbers/English, use \b
-                if re.search(r'[\u0590-\u05FF]', word):
-                    # Hebrew word - use Hebrew word boundaries
-                    pattern = rf'(?<![א-ת]){re.escape(word)}(?![א-ת])'
-                else:
-                    # Non-Hebrew (numbers, English) - use standard word boundaries
-                    pattern = rf'\b{re.escape(word)}\b'
-
-                try:
-                    compiled = re.compile(pattern)
-                    self.patterns.append((compiled, word, category))
-                except re.error:
-                    # Skip invalid patterns
-                    continue
+                if word:
+                    entries.setdefault(word, []).append((index, category))
+                index += 1
+
+        if not entries:
+            return
+
+        automaton = ahocorasick.Automaton()
+        for word, owners in entries.items():
+            # Hebrew words need Hebrew word boundaries,
+            # non-Hebrew (numbers, English) standard word boundaries
+            is_hebrew = re.search(r'[\u0590-\u05FF]', word) is not None
+            automaton.add_word(word, (word, is_hebrew, owners))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    @staticmethod
+    def _at_boundaries(text: str, start: int, end: int, is_hebrew: bool) -> bool:
+        """Check the word boundaries around text[start:end]."""
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        if is_hebrew:
+            # Not adjacent to Hebrew letters
+            return not (before and _is_hebrew_letter(before)) and not (after and _is_hebrew_letter(after))
+        # Same as \b on both sides
+        return (
+            (bool(before) and _is_word_char(before)) != _is_word_char(text[start])
+            and _is_word_char(text[end - 1]) != (bool(after) and _is_word_char(after))
+        )
 
     def detect(self, text: str) -> list[PIIMatch]:
         """
@@ -62,25 +89,44 @@ class CategoryDetector:
         Returns:
             List of PIIMatch objects for each match found
         """
+        if self._automaton is None:
+            return []
+
+        # Find every occurrence of every word in one pass
+        hits = []
+        for end_index, (word, is_hebrew, owners) in self._automaton.iter(text):
+            end = end_index + 1
+            start = end - len(word)
+            if not self._at_boundaries(text, start, end, is_hebrew):
+                continue
+            for index, category in owners:
+                hits.append((index, start, end, word, category))
+
+        # Report in word-list order, then by position
+        hits.sort()
+
         matches: list[PIIMatch] = []
         seen_positions: set[tuple[int, int]] = set()
-
-        for pattern, word, category in self.patterns:
-            for match in pattern.finditer(text):
-                start, end = match.start(), match.end()
-
-                # Skip if this position was already matched
-                if (start, end) in seen_positions:
-                    continue
-
-                seen_positions.add((start, end))
-                matches.append(PIIMatch(
-                    text=match.group(),
-                    type=self.pii_type,
-                    start=start,
-                    end=end,
-                    pattern_name=f"category:{category}",
-                ))
+        last_end: dict[int, int] = {}
+
+        for index, start, end, word, category in hits:
+            # Occurrences of the same word entry don't overlap (like finditer)
+            if start < last_end.get(index, 0):
+                continue
+            last_end[index] = end
+
+            # Skip if this position was already matched
+            if (start, end) in seen_positions:
+                continue
+
+            seen_positions.add((start, end))
+            matches.append(PIIMatch(
+                text=word,
+                type=self.pii_type,
+                start=start,
+                end=end,
+                pattern_name=f"category:{category}",
+            ))
 
         return matches
 
@@ -1,4 +1,5 @@
 import re
+from typing import Iterator
 from api.detectors.base import Detector, PIIMatch
 
 
@@ -8,51 +9,34 @@ class EnglishNameDetector(Detector):
     name = "english_name"
     pii_type = "NAME"
 
-    # Patterns for English name fields (space only, not newlines)
-    PATTERNS = [
-        # Name: followed by text
-        re.compile(r'\bName\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']+)', re.IGNORECASE),
-        # First Name: followed by text
-        re.compile(r'\bFirst\s+Name\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']+)', re.IGNORECASE),
-        # Last Name: followed by text
-        re.compile(r'\bLast\s+Name\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']+)', re.IGNORECASE),
-        # Surname: followed by text
-        re.compile(r'\bSurname\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']+)', re.IGNORECASE),
-        # Full Name: followed by text
-        re.compile(r'\bFull\s+Name\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']+)', re.IGNORECASE),
-    ]
+    # Name field labels (Name, First Name, Last Name, Surname, Full Name)
+    # followed by the name itself (space only, not newlines), in one pass.
+    # The name run is possessive: nothing follows it, so backtracking into it
+    # can never help and the engine needn't keep backtrack points (Python 3.11+)
+    PATTERN = re.compile(
+        r'\b(?:Name|First\s+Name|Last\s+Name|Surname|Full\s+Name)'
+        r'\s*[:\-]?\s*([A-Za-z][A-Za-z \-\']++)',
+        re.IGNORECASE,
+    )
 
     def detect(self, text: str) -> list[PIIMatch]:
         """Find all English names in text."""
-        matches = []
-        seen_positions = set()
-
-        for pattern in self.PATTERNS:
-            for match in pattern.finditer(text):
-                # Extract the name part (group 1)
-                name_text = match.group(1).strip()
-                if not name_text:
-                    continue
-
-                # Skip very short matches (likely false positives)
-                if len(name_text) < 2:
-                    continue
-
-                # Calculate actual position of the name
-                name_start = match.start(1)
-                name_end = match.end(1)
-
-                # Avoid duplicates
-                pos_key = (name_start, name_end)
-                if pos_key in seen_positions:
-                    continue
-                seen_positions.add(pos_key)
-
-                matches.append(PIIMatch(
-                    text=name_text,
-                    type=self.pii_type,
-                    start=name_start,
-                    end=name_end
-                ))
-
-        return matches
+        return list(self.iter_matches(text))
+
+    def iter_matches(self, text: str) -> Iterator[PIIMatch]:
+        """Lazily yield English names in text order, without building a list."""
+        # A single finditer never reports the same span twice
+        for match in self.PATTERN.finditer(text):
+            # Extract the name part (group 1)
+            name_text = match.group(1).strip()
+
+            # Skip very short matches (likely false positives)
+            if len(name_text) < 2:
+                continue
+
+            yield PIIMatch(
+                text=name_text,
+                type=self.pii_type,
+                start=match.start(1),
+                end=match.end(1)
+            )
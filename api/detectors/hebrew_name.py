@@ -8,14 +8,14 @@ class HebrewNameDetector(Detector):
     name = "hebrew_name"
     pii_type = "NAME"
 
-    # Patterns for Hebrew name fields
+    # Patterns for Hebrew name fields (possessive name run, as in EnglishNameDetector)
     PATTERNS = [
         # שם: followed by Hebrew text
-        re.compile(r'שם\s*[:\-]?\s*([\u0590-\u05FF\s]+)', re.UNICODE),
+        re.compile(r'שם\s*[:\-]?\s*([\u0590-\u05FF\s]++)', re.UNICODE),
         # שם פרטי: (first name)
-        re.compile(r'שם\s+פרטי\s*[:\-]?\s*([\u0590-\u05FF\s]+)', re.UNICODE),
+        re.compile(r'שם\s+פרטי\s*[:\-]?\s*([\u0590-\u05FF\s]++)', re.UNICODE),
         # שם משפחה: (family name)
-        re.compile(r'שם\s+משפחה\s*[:\-]?\s*([\u0590-\u05FF\s]+)', re.UNICODE),
+        re.compile(r'שם\s+משפחה\s*[:\-]?\s*([\u0590-\u05FF\s]++)', re.UNICODE),
     ]
 
     def detect(self, text: str) -> list[PIIMatch]:
@@ -1,5 +1,6 @@
 import re
 from api.detectors.base import Detector, PIIMatch
+from api.detectors.validators import israeli_id_checksum
 
 
 class IsraeliIdDetector(Detector):
@@ -31,16 +32,4 @@ class IsraeliIdDetector(Detector):
         """
         Validate Israeli ID using the official checksum algorithm.
         """
-        if len(id_number) != 9:
-            return False
-
-        total = 0
-        for i, digit in enumerate(id_number):
-            num = int(digit)
-            if i % 2 == 1:
-                num *= 2
-            if num > 9:
-                num = num // 10 + num % 10
-            total += num
-
-        return total % 10 == 0
+        return israeli_id_checksum(id_number)
@@ -3,12 +3,362 @@ RegexDetector - configurable pattern-based PII detector.
 Handles all regex-based detection with optional validation.
 """
 import re
-from typing import Optional
+import threading
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Optional
 
 from api.detectors.base import Detector, PIIMatch
 from api.detectors.validators import get_validator
 from api.config.schemas import PIIPatternConfig
 
+try:
+    import hyperscan
+except ImportError:
+    # Optional: wheels only exist for Linux x86_64, fall back to plain `re`
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    # Optional: without RE2 every pattern runs on the backtracking `re` engine
+    re2 = None
+
+
+# Python's Unicode-aware shorthand classes spelled out. RE2's own \d, \s and
+# \w only match ASCII (PDF text has NBSPs, Hebrew letters, etc.), and even
+# Hyperscan's Unicode \s misses \x1c-\x1f, which str.isspace() includes
+_PY_CLASS_ITEMS = {
+    "d": r"\p{Nd}",
+    "s": r"\t\n\x0b\f\r\x1c-\x20\x85\xa0\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}",
+    "w": r"\p{L}\p{N}_",
+}
+
+
+# The rest of a `{,n}` / `{,}` quantifier after its `{`; Python reads these
+# as `{0,n}` / `{0,}`, while RE2 and Hyperscan take them literally
+_OPEN_LOWER_BOUND = re.compile(r',(\d*)\}')
+
+
+def _to_re2_syntax(regex: str, prefilter: bool = False) -> Optional[str]:
+    """
+    Translate a Python regex to RE2 syntax with the same Unicode semantics.
+
+    Args:
+        regex: Python regex source
+        prefilter: Drop word boundaries and `$` instead of giving up. Removing
+            a zero-width assertion only widens what matches, so the result
+            is still a sound prefilter for the original pattern.
+
+    Returns:
+        The RE2 pattern, or None if the pattern relies on something RE2
+        can't express the same way (word boundaries, `$` before a trailing
+        newline, negated shorthand classes inside a set, `[:` inside a
+        set, which RE2 would read as a POSIX class)
+    """
+    out: list[str] = []
+    in_class = False
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        i += 1
+
+        if char == "\\" and i < len(regex):
+            escape = regex[i]
+            i += 1
+            items = _PY_CLASS_ITEMS.get(escape.lower())
+            if escape == "b" and in_class:
+                # Inside a set \b is a backspace, not a word boundary
+                out.append("\\x08")
+            elif escape in "bB" and prefilter:
+                pass
+            elif escape in "bBN":
+                return None
+            elif items and escape.islower():
+                out.append(items if in_class else f"[{items}]")
+            elif items:
+                if in_class:
+                    return None
+                out.append(f"[^{items}]")
+            elif escape in "uU":
+                digits = 4 if escape == "u" else 8
+                out.append(f"\\x{{{regex[i:i + digits]}}}")
+                i += digits
+            else:
+                out.append(char + escape)
+            continue
+
+        if in_class:
+            if char == "]":
+                in_class = False
+            elif char == "[" and regex.startswith(":", i):
+                return None
+        elif char == "{" and (quantifier := _OPEN_LOWER_BOUND.match(regex, i)):
+            out.append(f"{{0,{quantifier.group(1)}}}")
+            i = quantifier.end()
+            continue
+        elif char == "[":
+            in_class = True
+            # A leading ] (after an optional ^) is a literal, not the end of the set
+            if regex.startswith("^", i):
+                out.append(char + "^")
+                char, i = "", i + 1
+            if regex.startswith("]", i):
+                out.append(char + "\\]")
+                char, i = "", i + 1
+        elif char == "$":
+            if not prefilter:
+                return None
+            continue
+
+        out.append(char)
+
+    return "".join(out)
+
+
+def _to_hyperscan_syntax(regex: str) -> Optional[str]:
+    """
+    Translate a Python regex to Hyperscan (PCRE) syntax for prefiltering.
+
+    Hyperscan accepts the RE2 spelling of every translated construct, and a
+    prefilter only needs to match at least what `re` does, so the RE2
+    prefilter translation is reused as is.
+
+    Returns:
+        The Hyperscan pattern, or None if it can't be translated faithfully
+    """
+    return _to_re2_syntax(regex, prefilter=True)
+
+
+def _compile_re2(regex: str) -> Optional[object]:
+    """
+    Compile regex with RE2 (linear-time, no catastrophic backtracking).
+
+    Returns:
+        Compiled RE2 pattern, or None if RE2 can't run it with `re` semantics
+
+    Raises:
+        re2.error: If RE2 doesn't support a feature the pattern uses
+    """
+    if re2 is None:
+        return None
+    re2_syntax = _to_re2_syntax(regex)
+    if re2_syntax is None:
+        return None
+    options = re2.Options()
+    options.log_errors = False
+    return re2.compile(re2_syntax, options)
+
+
+@lru_cache(maxsize=256)
+def _compile_regex(regex: str) -> tuple[object, bool]:
+    """
+    Compile regex once per process, preferring RE2 when it's installed.
+
+    Returns:
+        Tuple of (compiled pattern, whether RE2 rejected it and `re` is used)
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    compiled = re.compile(regex, re.UNICODE)
+    try:
+        return _compile_re2(regex) or compiled, False
+    except re2.error:
+        return compiled, True
+
+
+def _record_hit(pattern_id: int, start: int, end: int, flags: int, hits: set[int]) -> None:
+    """Hyperscan match callback - remember which pattern may match."""
+    hits.add(pattern_id)
+
+
+class _HyperscanPrefilter:
+    """
+    Single-pass prefilter over all patterns using a Hyperscan database.
+
+    Hyperscan can't report capture groups and only approximates some
+    constructs, so patterns are compiled in prefilter mode: one scan tells
+    us which patterns *may* match, and only those are run through `re`.
+    Patterns Hyperscan rejects, or that can't be translated to its syntax
+    with `re` semantics, are always run through `re`.
+    """
+
+    FLAGS = (
+        hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_PREFILTER
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_ALLOWEMPTY
+    ) if hyperscan else 0
+
+    def __init__(self, regexes: tuple[str, ...]):
+        self._local = threading.local()
+        expressions = {}
+        for i, regex in enumerate(regexes):
+            # Patterns that can't be translated faithfully stay unfiltered
+            hyperscan_syntax = _to_hyperscan_syntax(regex)
+            if hyperscan_syntax is not None:
+                expressions[i] = hyperscan_syntax.encode("utf-8")
+        if not self._compile(expressions):
+            # Find the patterns Hyperscan can't handle and leave them unfiltered
+            expressions = {
+                i: expr for i, expr in expressions.items()
+                if self._compile({i: expr})
+            }
+            if not self._compile(expressions):
+                expressions = {}
+        self.filtered_ids = set(expressions)
+
+    def _compile(self, expressions: dict[int, bytes]) -> bool:
+        """Compile expressions into the database. Returns False on error."""
+        self.database = None
+        if not expressions:
+            return True
+        database = hyperscan.Database()
+        try:
+            database.compile(
+                expressions=list(expressions.values()),
+                ids=list(expressions.keys()),
+                elements=len(expressions),
+                flags=self.FLAGS,
+            )
+        except hyperscan.error:
+            return False
+        self.database = database
+        return True
+
+    def candidates(self, text: str) -> Optional[set[int]]:
+        """
+        Get indices of patterns that may match text.
+
+        Returns:
+            Set of candidate indices, or None if the text couldn't be scanned
+        """
+        if self.database is None:
+            return set()
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:
+            # Lone surrogates aren't valid UTF-8 input for Hyperscan
+            return None
+        hits: set[int] = set()
+        self.database.scan(
+            data,
+            match_event_handler=_record_hit,
+            context=hits,
+            scratch=self._scratch(),
+        )
+        return hits
+
+    def _scratch(self) -> "hyperscan.Scratch":
+        """Get this thread's scratch space (a scratch can't be shared between scans)."""
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        return scratch
+
+
+class _RE2SetPrefilter:
+    """
+    Single-pass prefilter over all patterns using an RE2 set.
+
+    Used when Hyperscan isn't installed: one linear-time scan reports which
+    patterns may match anywhere in the text, and only those are run again
+    to collect match positions and capture groups. Word boundaries and `$`
+    are dropped from the set's copy of a pattern (RE2 can't express them
+    with `re` semantics), which only widens it. Patterns RE2 can't run at
+    all are always run.
+    """
+
+    def __init__(self, regexes: tuple[str, ...]):
+        options = re2.Options()
+        options.log_errors = False
+        self._set = re2.Set.SearchSet(options)
+        # Set index -> pattern index
+        self._pattern_ids: list[int] = []
+        for i, regex in enumerate(regexes):
+            re2_syntax = _to_re2_syntax(regex, prefilter=True)
+            if re2_syntax is None:
+                continue
+            try:
+                self._set.Add(re2_syntax)
+            except re2.error:
+                continue
+            self._pattern_ids.append(i)
+        self._set.Compile()
+        self.filtered_ids = set(self._pattern_ids)
+
+    def candidates(self, text: str) -> Optional[set[int]]:
+        """
+        Get indices of patterns that may match text.
+
+        Returns:
+            Set of candidate indices, or None if the text couldn't be scanned
+        """
+        if not self._pattern_ids:
+            return set()
+        try:
+            hits = self._set.Match(text)
+        except UnicodeEncodeError:
+            # Lone surrogates can't be passed to RE2 as UTF-8
+            return None
+        return {self._pattern_ids[i] for i in hits or ()}
+
+
+_Prefilter = _HyperscanPrefilter | _RE2SetPrefilter
+
+# Prefilters compiled ahead of time by warm_prefilter: pattern regexes ->
+# (prefilter, regex -> id in that prefilter)
+_warm_prefilters: dict[tuple[str, ...], tuple[_Prefilter, dict[str, int]]] = {}
+
+
+def warm_prefilter(regexes: tuple[str, ...]) -> None:
+    """
+    Compile a prefilter for a pattern set ahead of time.
+
+    Hyperscan takes ~0.5s to compile a database, far too slow to do per
+    request, so the server patterns are compiled once at startup and every
+    detector over them or any subset of them (e.g. with some detectors
+    disabled) shares the result.
+    """
+    if regexes in _warm_prefilters:
+        return
+    if hyperscan is not None:
+        prefilter = _HyperscanPrefilter(regexes)
+    elif re2 is not None:
+        prefilter = _RE2SetPrefilter(regexes)
+    else:
+        return
+    ids = {regex: i for i, regex in reversed(list(enumerate(regexes)))}
+    _warm_prefilters[regexes] = (prefilter, ids)
+    # Pattern sets looked up before now may have fallen back to an RE2 set
+    _get_prefilter.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _get_prefilter(regexes: tuple[str, ...]) -> Optional[tuple[_Prefilter, tuple[int, ...]]]:
+    """
+    Get a single-pass prefilter for a pattern set.
+
+    Uses a warmed prefilter covering all the patterns if there is one.
+    Otherwise falls back to an RE2 set, which compiles in milliseconds, or
+    to no prefilter at all.
+
+    Returns:
+        Tuple of (prefilter, id in the prefilter of each regex), or None
+    """
+    for prefilter, ids in list(_warm_prefilters.values()):
+        if all(regex in ids for regex in regexes):
+            return prefilter, tuple(ids[regex] for regex in regexes)
+    if re2 is not None:
+        return _RE2SetPrefilter(regexes), tuple(range(len(regexes)))
+    return None
+
+
+# (pattern config, compiled regex, validator function or None)
+_CompiledPattern = tuple[PIIPatternConfig, object, Optional[Callable[[str], bool]]]
+
 
 class RegexDetector(Detector):
     """
@@ -19,29 +369,82 @@ class RegexDetector(Detector):
     name = "regex"
     pii_type = "VARIOUS"
 
-    def __init__(self, patterns: Optional[list[PIIPatternConfig]] = None):
+    def __init__(self, patterns: Optional[list[PIIPatternConfig]] = None, prefilter: bool = True):
         """
         Initialize with list of pattern configurations.
 
         Args:
             patterns: List of PIIPatternConfig objects
+            prefilter: Skip patterns a single-pass prefilter rules out (when
+                one is available). Results are the same either way.
         """
         self.patterns = patterns or []
-        self._compiled_patterns: list[tuple[PIIPatternConfig, re.Pattern]] = []
+        self.use_prefilter = prefilter
+        self._compiled_patterns: list[_CompiledPattern] = []
+        self._prefilter: Optional[_Prefilter] = None
+        # Id in the prefilter of each compiled pattern
+        self._prefilter_ids: tuple[int, ...] = ()
+        # Patterns left on the backtracking engine (reported to the client)
+        self.warnings: list[str] = []
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
         """Pre-compile regex patterns for performance."""
         self._compiled_patterns = []
+        self.warnings = []
         for pattern_config in self.patterns:
             if not pattern_config.enabled:
                 continue
-            try:
-                compiled = re.compile(pattern_config.regex, re.UNICODE)
-                self._compiled_patterns.append((pattern_config, compiled))
-            except re.error as e:
-                # Log warning but continue with other patterns
-                print(f"Warning: Invalid regex pattern '{pattern_config.name}': {e}")
+            compiled = self._compile_pattern(pattern_config)
+            if compiled is not None:
+                self._compiled_patterns.append(compiled)
+        self._build_prefilter()
+
+    def _compile_pattern(self, pattern_config: PIIPatternConfig) -> Optional[_CompiledPattern]:
+        """
+        Compile a single pattern and resolve its validator.
+
+        Patterns RE2 can't run fall back to `re`, whose backtracking can
+        freeze on pathological input, so they are recorded in warnings.
+        """
+        try:
+            compiled, re2_rejected = _compile_regex(pattern_config.regex)
+        except re.error as e:
+            # Log warning but continue with other patterns
+            print(f"Warning: Invalid regex pattern '{pattern_config.name}': {e}")
+            return None
+
+        if re2_rejected:
+            self.warnings.append(
+                f"Pattern '{pattern_config.name}' uses regex features RE2 doesn't support "
+                "(e.g. lookarounds or backreferences); it may be slow on some documents."
+            )
+        return pattern_config, compiled, get_validator(pattern_config.validator)
+
+    def _build_prefilter(self) -> None:
+        """Look up a single-pass prefilter (Hyperscan or RE2) for all patterns, if available."""
+        self._prefilter, self._prefilter_ids = None, ()
+        if self.use_prefilter and self._compiled_patterns:
+            found = _get_prefilter(
+                tuple(pattern_config.regex for pattern_config, _, _ in self._compiled_patterns)
+            )
+            if found is not None:
+                self._prefilter, self._prefilter_ids = found
+
+    def _candidate_patterns(self, text: str) -> list[_CompiledPattern]:
+        """Get the compiled patterns worth running on text, in config order."""
+        if self._prefilter is None:
+            return self._compiled_patterns
+
+        hits = self._prefilter.candidates(text)
+        if hits is None:
+            return self._compiled_patterns
+
+        skipped = self._prefilter.filtered_ids - hits
+        return [
+            compiled for compiled, prefilter_id in zip(self._compiled_patterns, self._prefilter_ids)
+            if prefilter_id not in skipped
+        ]
 
     def detect(self, text: str) -> list[PIIMatch]:
         """
@@ -56,10 +459,7 @@ class RegexDetector(Detector):
         matches: list[PIIMatch] = []
         seen_positions: set[tuple[int, int]] = set()
 
-        for pattern_config, compiled_regex in self._compiled_patterns:
-            # Get validator function if specified
-            validator = get_validator(pattern_config.validator)
-
+        for pattern_config, compiled_regex, validator in self._candidate_patterns(text):
             for match in compiled_regex.finditer(text):
                 # Get the captured group or full match
                 if pattern_config.capture_group > 0:
@@ -109,7 +509,7 @@ class RegexDetector(Detector):
                 ))
 
         # Sort by position (start, then end)
-        matches.sort(key=lambda m: (m.start, m.end))
+        matches.sort(key=attrgetter("start", "end"))
 
         return matches
 
@@ -117,18 +517,18 @@ class RegexDetector(Detector):
         """Add a pattern to the detector."""
         self.patterns.append(pattern)
         if pattern.enabled:
-            try:
-                compiled = re.compile(pattern.regex, re.UNICODE)
-                self._compiled_patterns.append((pattern, compiled))
-            except re.error as e:
-                print(f"Warning: Invalid regex pattern '{pattern.name}': {e}")
+            compiled = self._compile_pattern(pattern)
+            if compiled is not None:
+                self._compiled_patterns.append(compiled)
+                self._build_prefilter()
 
     def remove_pattern(self, name: str) -> None:
         """Remove a pattern by name."""
         self.patterns = [p for p in self.patterns if p.name != name]
         self._compiled_patterns = [
-            (p, r) for p, r in self._compiled_patterns if p.name != name
+            compiled for compiled in self._compiled_patterns if compiled[0].name != name
         ]
+        self._build_prefilter()
 
     def set_patterns(self, patterns: list[PIIPatternConfig]) -> None:
         """Replace all patterns."""
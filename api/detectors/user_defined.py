@@ -1,3 +1,7 @@
+from typing import Optional
+
+import ahocorasick
+
 from api.detectors.base import Detector, PIIMatch
 
 
@@ -16,32 +20,50 @@ class UserDefinedDetector(Detector):
                    e.g., [{"text": "John Doe", "type": "NAME"}]
         """
         self.terms = terms or []
+        self._automaton = self._build_automaton()
+
+    def _build_automaton(self) -> Optional[ahocorasick.Automaton]:
+        """Index all terms in one Aho-Corasick automaton (None if there are none)."""
+        # Term text -> (index, type) of every entry with that text
+        entries: dict[str, list[tuple[int, str]]] = {}
+        for index, term in enumerate(self.terms):
+            search_text = term.get("text", "")
+            if search_text:
+                entries.setdefault(search_text, []).append(
+                    (index, term.get("type", "USER_DEFINED"))
+                )
+
+        if not entries:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for search_text, owners in entries.items():
+            automaton.add_word(search_text, (search_text, owners))
+        automaton.make_automaton()
+        return automaton
 
     def detect(self, text: str) -> list[PIIMatch]:
         """Find all user-defined terms in text using exact match."""
-        matches = []
+        if self._automaton is None:
+            return []
 
-        for term in self.terms:
-            search_text = term.get("text", "")
-            pii_type = term.get("type", "USER_DEFINED")
-
-            if not search_text:
-                continue
-
-            # Find all occurrences
-            start = 0
-            while True:
-                pos = text.find(search_text, start)
-                if pos == -1:
-                    break
-
-                matches.append(PIIMatch(
-                    text=search_text,
-                    type=pii_type,
-                    start=pos,
-                    end=pos + len(search_text),
-                    pattern_name="user_defined",
-                ))
-                start = pos + 1
-
-        return matches
+        # Find all occurrences of all terms (including overlapping ones) in one pass
+        hits = []
+        for end_index, (search_text, owners) in self._automaton.iter(text):
+            start = end_index - len(search_text) + 1
+            for index, pii_type in owners:
+                hits.append((index, start, search_text, pii_type))
+
+        # Report in term order, then by position
+        hits.sort()
+
+        return [
+            PIIMatch(
+                text=search_text,
+                type=pii_type,
+                start=start,
+                end=start + len(search_text),
+                pattern_name="user_defined",
+            )
+            for _, start, search_text, pii_type in hits
+        ]
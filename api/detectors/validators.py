@@ -5,6 +5,10 @@ These validate that matched text is actually valid PII (e.g., checksum validatio
 from typing import Callable, Optional
 
 
+# Digit sum of 2*d for each digit d (the checksum's doubled positions)
+_DOUBLED_DIGIT_SUM = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
 def israeli_id_checksum(id_number: str) -> bool:
     """
     Validate Israeli ID using the official checksum algorithm.
@@ -17,19 +21,20 @@ def israeli_id_checksum(id_number: str) -> bool:
         True if checksum is valid
     """
     # Remove any non-digit characters
-    digits = "".join(c for c in id_number if c.isdigit())
+    if id_number.isdigit():
+        digits = id_number
+    else:
+        digits = "".join(c for c in id_number if c.isdigit())
 
     if len(digits) != 9:
         return False
 
-    total = 0
-    for i, digit in enumerate(digits):
-        num = int(digit)
-        if i % 2 == 1:
-            num *= 2
-        if num > 9:
-            num = num // 10 + num % 10
-        total += num
+    d = list(map(int, digits))
+    doubled = _DOUBLED_DIGIT_SUM
+    total = (
+        d[0] + d[2] + d[4] + d[6] + d[8]
+        + doubled[d[1]] + doubled[d[3]] + doubled[d[5]] + doubled[d[7]]
+    )
 
     return total % 10 == 0
 
@@ -8,6 +8,9 @@ from api.replacements.mapper import ReplacementMapper
 class TextObfuscator(Obfuscator):
     """Replaces PII with fake values or placeholder text."""
 
+    # Type kept when matches overlap partially or share a span (higher wins)
+    OVERLAP_PRIORITY = {"ID": 3, "NAME": 2, "USER_DEFINED": 1}
+
     def __init__(
         self,
         mapper: Optional[ReplacementMapper] = None,
@@ -35,7 +38,8 @@ class TextObfuscator(Obfuscator):
     def obfuscate(self, text: str, matches: list[PIIMatch]) -> str:
         """
         Replace PII with fake values or placeholders.
-        Processes matches in reverse order to maintain position accuracy.
+        Overlapping matches are resolved first, then the output is built in
+        a single pass and joined once.
 
         Args:
             text: Original text
@@ -46,16 +50,36 @@ class TextObfuscator(Obfuscator):
         """
         if not matches:
             return text
+        return self.replace_resolved(text, self.resolve_overlaps(matches))
+
+    def replace_resolved(self, text: str, kept: list[PIIMatch]) -> str:
+        """
+        Replace matches already passed through resolve_overlaps().
 
-        # Sort by start position descending to replace from end to start
-        sorted_matches = sorted(matches, key=lambda m: m.start, reverse=True)
+        Callers that report on the replaced matches resolve them once and
+        hand the same list here instead of resolving again in obfuscate().
+
+        Args:
+            text: Original text
+            kept: Non-overlapping matches sorted by start position
 
-        result = text
-        for match in sorted_matches:
-            replacement = self._get_replacement(match)
-            result = result[:match.start] + replacement + result[match.end:]
+        Returns:
+            Text with PII replaced
+        """
+        if not kept:
+            return text
 
-        return result
+        # Built from the end of the text backwards, so pool values are handed
+        # out in the same order as always, then joined once
+        parts: list[str] = []
+        cursor = len(text)
+        for match in reversed(kept):
+            parts.append(text[match.end:cursor])
+            parts.append(self._get_replacement(match))
+            cursor = match.start
+        parts.append(text[:cursor])
+
+        return "".join(reversed(parts))
 
     def _get_replacement(self, match: PIIMatch) -> str:
         """Get replacement value for a match."""
@@ -72,3 +96,46 @@ class TextObfuscator(Obfuscator):
             match.type,
             self.placeholder_map.get("DEFAULT", "[REDACTED]")
         )
+
+    def resolve_overlaps(self, matches: list[PIIMatch]) -> list[PIIMatch]:
+        """
+        Merge overlapping matches in a single sweep.
+
+        A match contained in another is dropped in favour of the container;
+        identical spans are decided by OVERLAP_PRIORITY. Partially
+        overlapping matches are merged into their union, which takes the
+        type and pattern of the higher-priority match (the longer one on a
+        tie), so no part of either span is left unredacted. These are
+        exactly the matches obfuscate() replaces, so callers reporting on
+        the replacements should use this list rather than the raw detector
+        output.
+
+        Returns:
+            Non-overlapping matches sorted by start position
+        """
+        kept: list[PIIMatch] = []
+        for match in sorted(matches, key=lambda m: (m.start, -m.end)):
+            if not kept or match.start >= kept[-1].end:
+                kept.append(match)
+                continue
+            last = kept[-1]
+            if match.end <= last.end:
+                # Contained: sorting puts the container first
+                if (match.start, match.end) == (last.start, last.end) and (
+                    self._priority(match) > self._priority(last)
+                ):
+                    kept[-1] = match
+                continue
+            winner = max(last, match, key=lambda m: (self._priority(m), m.end - m.start))
+            kept[-1] = PIIMatch(
+                text=last.text + match.text[last.end - match.start:],
+                type=winner.type,
+                start=last.start,
+                end=match.end,
+                pattern_name=winner.pattern_name,
+            )
+        return kept
+
+    def _priority(self, match: PIIMatch) -> int:
+        """Rank a match against one it overlaps (higher wins)."""
+        return self.OVERLAP_PRIORITY.get(match.type, 0)
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class PageContent:
     """Content extracted from a single page/segment."""
     page_number: int
@@ -10,7 +11,7 @@ class PageContent:
     metadata: dict | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedPage:
     """Page content after obfuscation."""
     page_number: int
@@ -29,6 +30,10 @@ class Processor(ABC):
         """Extract text from file, per page/segment."""
         pass
 
+    def extract_text_from_path(self, path: Path) -> list[PageContent]:
+        """Extract text from a file on disk, per page/segment."""
+        return self.extract_text(Path(path).read_bytes())
+
     @abstractmethod
     def reassemble(self, pages: list[ProcessedPage]) -> bytes:
         """Rebuild file from processed pages."""
@@ -2,9 +2,15 @@
 PDF Processor with OCR support for Hebrew and English.
 Handles both text-based PDFs and scanned/image-based documents.
 """
+import copy
+import hashlib
 import io
+import mmap
 import os
 import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional
 
 import fitz  # PyMuPDF
@@ -22,6 +28,10 @@ HEBREW_FONT_PATHS = [
 ]
 
 
+# Pages sampled when deciding whether a PDF has a text layer
+TEXT_LAYER_SAMPLE_PAGES = 3
+
+
 def _find_hebrew_font() -> Optional[str]:
     """Find a system font that supports Hebrew characters."""
     for font_path in HEBREW_FONT_PATHS:
@@ -73,15 +83,22 @@ class PDFProcessor(Processor):
 
     supported_mimes = ["application/pdf"]
 
-    def __init__(self, ocr_config: Optional[OCRConfig] = None):
+    def __init__(self, ocr_config: Optional[OCRConfig] = None, cache_size: int = 0):
         """
         Initialize processor with OCR configuration.
 
         Args:
             ocr_config: OCR settings (languages, DPI, etc.)
+            cache_size: Number of extraction results to keep, keyed by the
+                SHA-256 of the file (0 disables the cache). Off by default:
+                results hold document text, and processors are shared
+                between requests.
         """
         self.ocr_config = ocr_config or OCRConfig()
         self._ocr_reader = None  # Lazy loaded
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[bytes, bool], list[PageContent]] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     @staticmethod
     def _fix_rtl_visual_order(text: str) -> str:
@@ -141,12 +158,32 @@ class PDFProcessor(Processor):
         Automatically detects if PDF has text layer or needs OCR.
 
         Args:
-            file: PDF file bytes
+            file: PDF file bytes (or a bytes-like buffer)
             force_ocr: Force OCR even if text layer exists
 
         Returns:
             List of PageContent with extracted text per page
         """
+        if not self.cache_size:
+            return self._extract_text(file, force_ocr)
+
+        key = (hashlib.sha256(file).digest(), force_ocr)
+        with self._cache_lock:
+            pages = self._cache.get(key)
+            if pages is not None:
+                self._cache.move_to_end(key)
+        if pages is None:
+            pages = self._extract_text(file, force_ocr)
+            with self._cache_lock:
+                self._cache[key] = pages
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        # Callers may modify pages (e.g. metadata), so never hand out the cached ones
+        return copy.deepcopy(pages)
+
+    def _extract_text(self, file: bytes, force_ocr: bool) -> list[PageContent]:
+        """Extract text from PDF, choosing between the text layer and OCR."""
         if force_ocr and self.ocr_config.enabled:
             pages = self._extract_with_ocr(file)
             # Mark as forced OCR
@@ -176,6 +213,39 @@ class PDFProcessor(Processor):
                 page.metadata["warning"] = "PDF appears to be image-based but OCR is disabled"
             return pages
 
+    def extract_text_from_path(
+        self,
+        path: Path,
+        force_ocr: bool = False,
+    ) -> list[PageContent]:
+        """
+        Extract text from a PDF on disk without reading it into memory first.
+
+        The file is memory-mapped and handed to the extractors as a
+        read-only buffer, so large archives aren't copied into a bytes
+        object up front.
+
+        Args:
+            path: Path to the PDF file
+            force_ocr: Force OCR even if text layer exists
+
+        Returns:
+            List of PageContent with extracted text per page
+        """
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                return self.extract_text(f.read(), force_ocr=force_ocr)
+
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                return self.extract_text(view, force_ocr=force_ocr)
+            finally:
+                view.release()
+
     def _has_text_layer(self, file: bytes) -> bool:
         """
         Check if PDF has extractable text or is image-based.
@@ -187,15 +257,18 @@ class PDFProcessor(Processor):
             True if text layer exists, False if OCR needed
         """
         doc = fitz.open(stream=file, filetype="pdf")
-        total_text = ""
+        total_length = 0
 
         try:
-            for page in doc:
-                total_text += page.get_text().strip()
+            # The first few pages are enough to tell a text PDF from a scan
+            for page in doc.pages(0, min(doc.page_count, TEXT_LAYER_SAMPLE_PAGES)):
+                total_length += len(page.get_text().strip())
+                if total_length > self.ocr_config.min_text_threshold:
+                    return True
         finally:
             doc.close()
 
-        return len(total_text) > self.ocr_config.min_text_threshold
+        return False
 
     def _extract_with_pymupdf(self, file: bytes) -> list[PageContent]:
         """
@@ -209,11 +282,13 @@ class PDFProcessor(Processor):
 
         try:
             for page_num, page in enumerate(doc):
-                raw_text = page.get_text()
+                # Run layout analysis once and reuse it for both text and blocks
+                textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+                raw_text = page.get_text(textpage=textpage)
                 # PyMuPDF returns text in logical order (correct for Hebrew)
                 # No RTL fix needed - the text is already correct
                 text = raw_text
-                blocks = page.get_text("blocks")
+                blocks = page.get_text("blocks", textpage=textpage)
 
                 pages.append(PageContent(
                     page_number=page_num + 1,
@@ -295,8 +370,14 @@ class PDFProcessor(Processor):
 
     def _add_tables(self, file: bytes, pages: list[PageContent]) -> None:
         """Add table data to pages using pdfplumber."""
+        # pdfplumber needs a seekable stream; an mmap-backed view from
+        # extract_text_from_path is one already, while BytesIO would copy it
+        if isinstance(file, memoryview) and isinstance(file.obj, mmap.mmap):
+            stream = file.obj
+        else:
+            stream = io.BytesIO(file)
         try:
-            with pdfplumber.open(io.BytesIO(file)) as pdf:
+            with pdfplumber.open(stream) as pdf:
                 for i, page in enumerate(pdf.pages):
                     tables = page.extract_tables()
                     if tables and i < len(pages):
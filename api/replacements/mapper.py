@@ -2,6 +2,8 @@
 ReplacementMapper - maintains consistent mappings between original and fake values.
 Ensures the same original value always maps to the same fake value within a session.
 """
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Optional
 from api.config.schemas import ReplacementPoolsConfig
 from api.replacements import generators
@@ -32,6 +34,9 @@ class ReplacementMapper:
         # Track which user mappings were actually used
         self._used_user_mappings: dict[str, str] = {}
 
+        # Every mapping handed out so far (user + auto), backing get_all_mappings()
+        self._used_mappings: dict[str, str] = {}
+
         # Track pool usage indices per type
         self._pool_indices: dict[str, int] = {
             "name_hebrew_first": 0,
@@ -73,6 +78,7 @@ class ReplacementMapper:
             replacement = self.user_mappings[original_clean]
             # Track that this user mapping was actually used
             self._used_user_mappings[original_clean] = replacement
+            self._used_mappings[original_clean] = replacement
             return replacement
 
         # 2. Check if we already assigned a fake for this original
@@ -82,6 +88,7 @@ class ReplacementMapper:
         # 3. Generate or pick from pool
         fake = self._get_new_replacement(original_clean, pii_type, pattern_name)
         self._auto_mappings[original_clean] = fake
+        self._used_mappings[original_clean] = fake
         return fake
 
     def _get_new_replacement(self, original: str, pii_type: str, pattern_name: str) -> str:
@@ -161,16 +168,17 @@ class ReplacementMapper:
         self._generated_counters[counter_key] = counter + 1
         return value
 
-    def get_all_mappings(self) -> dict[str, str]:
+    def get_all_mappings(self) -> Mapping[str, str]:
         """
         Get all mappings that were actually used during processing.
         Returns only user-defined mappings that were looked up + auto-assigned mappings.
         Useful for returning in API response.
+
+        Returns:
+            Read-only live view of original -> replacement, in order of
+            first use (call dict() on it for a copy)
         """
-        all_mappings = {}
-        all_mappings.update(self._auto_mappings)
-        all_mappings.update(self._used_user_mappings)  # Only user mappings that were actually used
-        return all_mappings
+        return MappingProxyType(self._used_mappings)
 
     def get_auto_mappings(self) -> dict[str, str]:
         """Get only auto-assigned mappings."""
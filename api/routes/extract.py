@@ -1,12 +1,13 @@
 """
 PDF extraction and anonymization endpoint.
 """
-import json
+import uuid
 
+import orjson
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 
-from api.processors.pdf import PDFProcessor
 from api.processors.base import ProcessedPage
 from api.storage.temp import storage
 
@@ -20,6 +21,7 @@ from api.routes.models import (
 )
 from api.routes.processing import (
     get_merged_config,
+    get_processor,
     create_detectors,
     create_obfuscation_components,
     detect_pii,
@@ -36,13 +38,22 @@ MAX_FILE_SIZE = 20 * 1024 * 1024
 async def extract_and_obfuscate(
     file: UploadFile = File(...),
     config: str = Form(default="{}"),
+    inline: bool = False,
 ):
-    """Extract text from PDF and obfuscate PII."""
+    """
+    Extract text from PDF and obfuscate PII.
+
+    With ?inline=true the anonymized PDF is returned directly instead of
+    being stored for /download, saving clients that download immediately
+    a disk write and a second round trip. Match details are only
+    available in the default JSON response.
+    """
     # Parse config
     try:
-        config_data = json.loads(config)
+        config_data = orjson.loads(config)
         request_config = ExtractRequestConfig(**config_data)
-    except (json.JSONDecodeError, ValueError) as e:
+    except ValueError as e:
+        # orjson.JSONDecodeError and pydantic's ValidationError are both ValueErrors
         raise HTTPException(status_code=400, detail=f"Invalid config JSON: {e}")
 
     # Read and validate file
@@ -57,7 +68,7 @@ async def extract_and_obfuscate(
     merged_config = get_merged_config(request_config)
 
     # Create components
-    processor = PDFProcessor(ocr_config=merged_config.ocr)
+    processor = get_processor(merged_config.ocr)
     regex_detector, user_detector, category_detector = create_detectors(merged_config)
     mapper, obfuscator = create_obfuscation_components(merged_config)
 
@@ -66,6 +77,7 @@ async def extract_and_obfuscate(
 
     # Collect warnings
     warnings = _collect_warnings(pages)
+    warnings.extend(regex_detector.warnings)
 
     # Process each page
     processed_pages = []
@@ -75,8 +87,12 @@ async def extract_and_obfuscate(
     for page in pages:
         all_matches = detect_pii(page.text, regex_detector, user_detector, category_detector)
 
+        # Only the matches that survive overlap resolution are replaced,
+        # so only those are reported (and assigned replacements)
+        kept_matches = obfuscator.resolve_overlaps(all_matches)
+
         # Obfuscate text
-        processed_text = obfuscator.obfuscate(page.text, all_matches)
+        processed_text = obfuscator.replace_resolved(page.text, kept_matches)
 
         # Build processed page
         processed_pages.append(ProcessedPage(
@@ -100,21 +116,34 @@ async def extract_and_obfuscate(
                     pattern_name=match.pattern_name,
                 ),
             )
-            for match in all_matches
+            for match in kept_matches
         ]
 
         page_summaries.append(PageSummary(
             page_number=page.page_number,
-            matches_found=len(all_matches),
+            matches_found=len(kept_matches),
             matches=match_responses,
         ))
 
-        total_matches += len(all_matches)
+        total_matches += len(kept_matches)
 
     # Collect obfuscated text and reassemble PDF
     full_obfuscated_text = "\n\n".join(page.processed_text for page in processed_pages)
     output_content = processor.reassemble(processed_pages)
-    file_id = storage.save(output_content)
+
+    if inline:
+        return Response(
+            content=output_content,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename=anonymized_{uuid.uuid4()}.pdf"
+            }
+        )
+
+    # Write on the threadpool so the disk write doesn't block the event loop
+    file_id = await run_in_threadpool(storage.save, output_content)
+    # Release the PDF bytes now rather than holding them while building the response
+    del output_content
 
     return ExtractResponse(
         file_id=file_id,
@@ -157,7 +186,7 @@ def _collect_warnings(pages) -> list[str]:
 @router.get("/download/{file_id}")
 async def download_file(file_id: str):
     """Download processed file by ID."""
-    content = storage.get(file_id)
+    content = await run_in_threadpool(storage.get, file_id)
     if not content:
         raise HTTPException(status_code=404, detail="File not found or expired")
 
@@ -176,7 +205,7 @@ async def extract_text_only(
     config: str = Form(default="{}"),
 ):
     """Extract and anonymize text, returning text instead of PDF."""
-    return await extract_and_obfuscate(file=file, config=config)
+    return await extract_and_obfuscate(file=file, config=config, inline=False)
 
 
 @router.post("/extract/plain", response_model=PlainTextResponse)
@@ -188,11 +217,12 @@ async def extract_plain_text(request: PlainTextRequest):
     mapper, obfuscator = create_obfuscation_components(merged_config)
 
     all_matches = detect_pii(request.text, regex_detector, user_detector, category_detector)
-    obfuscated_text = obfuscator.obfuscate(request.text, all_matches)
+    kept_matches = obfuscator.resolve_overlaps(all_matches)
+    obfuscated_text = obfuscator.replace_resolved(request.text, kept_matches)
 
     return PlainTextResponse(
-        total_matches=len(all_matches),
+        total_matches=len(kept_matches),
         mappings_used=mapper.get_all_mappings(),
         obfuscated_text=obfuscated_text,
-        warnings=[],
+        warnings=regex_detector.warnings,
     )
@@ -8,13 +8,15 @@ from api.config import (
     merge_config,
     RequestConfig,
     MergedConfig,
+    OCRConfig,
 )
-from api.detectors.regex import RegexDetector
+from api.detectors.regex import RegexDetector, warm_prefilter
 from api.detectors.user_defined import UserDefinedDetector
 from api.detectors.category import CategoryDetector
 from api.detectors.base import PIIMatch
 from api.obfuscators.text import TextObfuscator
 from api.replacements.mapper import ReplacementMapper
+from api.processors.pdf import PDFProcessor
 
 from api.routes.models import ExtractRequestConfig
 
@@ -22,6 +24,20 @@ from api.routes.models import ExtractRequestConfig
 # Load server config at startup
 _server_config = load_server_config()
 
+# Compile the server patterns' prefilter once now; per-request detectors
+# (any subset of these patterns) look it up instead of compiling their own
+warm_prefilter(tuple(
+    pattern.regex for pattern in _server_config.patterns if pattern.enabled
+))
+
+# Processors shared across requests, keyed by OCR settings
+# (PDFProcessor keeps no per-request state)
+_processors: dict[str, PDFProcessor] = {}
+
+# Extractions kept per processor, keyed by content hash. Off in production
+# (uploads rarely repeat); the API tests turn it on for their shared PDF
+extraction_cache_size = 0
+
 
 def get_merged_config(request_config: Optional[ExtractRequestConfig] = None) -> MergedConfig:
     """Get merged configuration (server + request)."""
@@ -36,6 +52,18 @@ def get_merged_config(request_config: Optional[ExtractRequestConfig] = None) ->
     return merge_config(_server_config, request_config_obj)
 
 
+def get_processor(ocr_config: OCRConfig) -> PDFProcessor:
+    """Get the shared PDF processor for the given OCR settings."""
+    key = ocr_config.model_dump_json()
+    processor = _processors.get(key)
+    if processor is None:
+        processor = _processors[key] = PDFProcessor(
+            ocr_config=ocr_config,
+            cache_size=extraction_cache_size,
+        )
+    return processor
+
+
 def create_detectors(
     merged_config: MergedConfig
 ) -> tuple[RegexDetector, Optional[UserDefinedDetector], Optional[CategoryDetector]]:
@@ -79,32 +107,36 @@ def detect_pii(
     """Detect PII in text using available detectors."""
     all_matches: list[PIIMatch] = []
 
+    # Characters covered by accepted matches, so an overlap check costs
+    # O(match length) instead of a scan over every accepted match
+    claimed = bytearray(len(text))
+
+    def accept(match: PIIMatch) -> None:
+        all_matches.append(match)
+        claimed[match.start:match.end] = b"\x01" * (match.end - match.start)
+
+    def overlaps(match: PIIMatch) -> bool:
+        return claimed.find(1, match.start, match.end) != -1
+
     # User-defined matches first (take priority)
     if user_detector:
         user_matches = user_detector.detect(text)
-        all_matches.extend(user_matches)
+        for user_match in user_matches:
+            accept(user_match)
 
     # Category-based detection (e.g., military units)
     if category_detector:
         category_matches = category_detector.detect(text)
         for new_match in category_matches:
-            overlaps = any(
-                (new_match.start < existing.end and new_match.end > existing.start)
-                for existing in all_matches
-            )
-            if not overlaps:
-                all_matches.append(new_match)
+            if not overlaps(new_match):
+                accept(new_match)
 
     # Pattern-based detection
     pattern_matches = regex_detector.detect(text)
 
     # Filter out matches that overlap with existing matches
     for new_match in pattern_matches:
-        overlaps = any(
-            (new_match.start < existing.end and new_match.end > existing.start)
-            for existing in all_matches
-        )
-        if not overlaps:
-            all_matches.append(new_match)
+        if not overlaps(new_match):
+            accept(new_match)
 
     return all_matches
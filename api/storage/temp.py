@@ -1,3 +1,4 @@
+import heapq
 import time
 import uuid
 import threading
@@ -13,6 +14,11 @@ class TempFileStorage:
     def __init__(self, base_dir: str = "/tmp/pdf_extractor"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # Min-heap of (expiry time, path); the cleanup thread sleeps until
+        # the earliest entry is due instead of rescanning the directory
+        self._expiry: list[tuple[float, Path]] = []
+        self._expiry_changed = threading.Condition()
+        self._schedule_existing_files()
         self._start_cleanup_thread()
 
     def save(self, content: bytes, extension: str = ".pdf") -> str:
@@ -25,6 +31,7 @@ class TempFileStorage:
         file_id = str(uuid.uuid4())
         file_path = self.base_dir / f"{file_id}{extension}"
         file_path.write_bytes(content)
+        self._schedule(file_path, time.time() + FILE_TTL)
         return file_id
 
     def get(self, file_id: str, extension: str = ".pdf") -> bytes | None:
@@ -42,24 +49,50 @@ class TempFileStorage:
             return True
         return False
 
-    def _cleanup_old_files(self):
-        """Remove files older than TTL."""
-        current_time = time.time()
+    def _schedule(self, file_path: Path, expires_at: float):
+        """Register a file for removal at the given time."""
+        with self._expiry_changed:
+            heapq.heappush(self._expiry, (expires_at, file_path))
+            self._expiry_changed.notify()
+
+    def _schedule_existing_files(self):
+        """Schedule files left over from a previous run (one scan at startup)."""
         for file_path in self.base_dir.iterdir():
             if file_path.is_file():
-                file_age = current_time - file_path.stat().st_mtime
-                if file_age > FILE_TTL:
-                    try:
-                        file_path.unlink()
-                    except OSError:
-                        pass
+                try:
+                    expires_at = file_path.stat().st_mtime + FILE_TTL
+                except OSError:
+                    continue
+                heapq.heappush(self._expiry, (expires_at, file_path))
+
+    def _pop_expired(self, now: float) -> list[Path]:
+        """Remove and return the paths whose expiry time has passed."""
+        expired = []
+        with self._expiry_changed:
+            while self._expiry and self._expiry[0][0] <= now:
+                expired.append(heapq.heappop(self._expiry)[1])
+        return expired
+
+    def _cleanup_old_files(self):
+        """Remove files older than TTL."""
+        for file_path in self._pop_expired(time.time()):
+            # Files deleted explicitly keep their heap entry; skip them
+            try:
+                file_path.unlink(missing_ok=True)
+            except OSError:
+                pass
 
     def _start_cleanup_thread(self):
-        """Start background thread for periodic cleanup."""
+        """Start background thread that removes files as they expire."""
         def cleanup_loop():
             while True:
-                time.sleep(300)  # Run every 5 minutes
                 self._cleanup_old_files()
+                with self._expiry_changed:
+                    timeout = None
+                    if self._expiry:
+                        timeout = max(0.0, self._expiry[0][0] - time.time())
+                    # Woken early when a new file is scheduled
+                    self._expiry_changed.wait(timeout)
 
         thread = threading.Thread(target=cleanup_loop, daemon=True)
         thread.start()
@@ -5,3 +5,69 @@ from pathlib import Path
 # tests is now under api/, so go up two levels
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
+
+import pytest
+from types import MappingProxyType
+
+from api.config import load_server_config
+from api.detectors.regex import RegexDetector, warm_prefilter
+
+
+@pytest.fixture(scope="session")
+def server_config():
+    """Server config loaded once per test session (treat as read-only)."""
+    return load_server_config()
+
+
+@pytest.fixture(scope="session")
+def default_replacements(server_config):
+    """Default replacements from the server config, read-only."""
+    return MappingProxyType(server_config.default_replacements)
+
+
+@pytest.fixture(scope="session")
+def configured_detector(server_config):
+    """RegexDetector compiled once from the server config patterns (prefiltered, as in the API)."""
+    warm_prefilter(tuple(p.regex for p in server_config.patterns if p.enabled))
+    return RegexDetector(patterns=server_config.patterns)
+
+
+@pytest.fixture(scope="session")
+def full_scan_detector(server_config):
+    """RegexDetector over the server config patterns that runs every pattern (reference output)."""
+    return RegexDetector(patterns=server_config.patterns, prefilter=False)
+
+
+RESOURCES_DIR = Path(__file__).parent / "resources"
+
+
+def _read_resource(name: str) -> str:
+    """Read a text resource, skipping the requesting test if it's missing."""
+    path = RESOURCES_DIR / name
+    if not path.exists():
+        pytest.skip(f"Test resource file not found: {name}")
+    return path.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def medical_form_original():
+    """Original medical form text, read once per session."""
+    return _read_resource("medical_form_original.txt")
+
+
+@pytest.fixture(scope="session")
+def medical_form_anonymized():
+    """Expected anonymized medical form text, read once per session."""
+    return _read_resource("medical_form_anonimyzed.txt")
+
+
+@pytest.fixture(scope="session")
+def medical_summary_original():
+    """Original medical summary text, read once per session."""
+    return _read_resource("medical_summary_original.txt")
+
+
+@pytest.fixture(scope="session")
+def medical_summary_anonymized():
+    """Expected anonymized medical summary text, read once per session."""
+    return _read_resource("medical_summary_anonymized.txt")
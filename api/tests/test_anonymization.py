@@ -3,7 +3,6 @@ Tests for the PDF anonymization pipeline.
 Compares API output against expected anonymized files.
 """
 import pytest
-from pathlib import Path
 
 from api.config import load_server_config, PIIPatternConfig
 from api.config.schemas import ReplacementPoolsConfig
@@ -14,10 +13,6 @@ from api.replacements.mapper import ReplacementMapper
 from api.obfuscators.text import TextObfuscator
 
 
-# Path to test resources
-RESOURCES_PATH = Path(__file__).parent / "resources"
-
-
 class TestRegexDetector:
     """Tests for the configurable RegexDetector."""
 
@@ -114,6 +109,109 @@ class TestRegexDetector:
         assert "PHONE" in types
         assert "EMAIL" in types
 
+    def test_unsupported_pattern_falls_back_with_warning(self):
+        """Test that patterns RE2 can't run still match, with a warning."""
+        pytest.importorskip("re2")
+        patterns = [
+            PIIPatternConfig(
+                name="id_after_label",
+                pii_type="ID",
+                regex=r"(?<=ID: )\d+",
+            )
+        ]
+        detector = RegexDetector(patterns=patterns)
+
+        matches = detector.detect("ID: 12345")
+
+        assert len(matches) == 1
+        assert matches[0].text == "12345"
+        assert any("id_after_label" in w for w in detector.warnings)
+
+    @pytest.mark.parametrize("regex, matching, not_matching", [
+        # Python reads {,3} as {0,3}; RE2 would take it literally
+        (r"ID\d{,3}X", "ID12X", "ID1234X"),
+        # Python reads [[:digit:]] as a plain set, RE2 as a POSIX class
+        (r"[[:digit:]]+", "t]", "12"),
+    ])
+    def test_re2_keeps_re_semantics(self, regex, matching, not_matching):
+        """Test that patterns are only run on RE2 when it means the same thing."""
+        from api.detectors.regex import _compile_regex
+
+        compiled, _ = _compile_regex(regex)
+
+        assert compiled.search(matching)
+        assert compiled.search(not_matching) is None
+
+    def test_prefilter_does_not_change_matches(self, configured_detector, full_scan_detector, medical_form_original):
+        """Test that the prefilter finds exactly what a full scan finds."""
+        text = medical_form_original
+
+        assert configured_detector.detect(text) == full_scan_detector.detect(text)
+
+    @pytest.mark.parametrize("text", [
+        # Python's \s includes \x1c-\x1f, Hyperscan's Unicode \s doesn't
+        "גיל:\x1c42",
+        "שם האב:\x1fדוד",
+        "First Name:\x1dJohn",
+    ])
+    def test_prefilter_keeps_python_whitespace(self, configured_detector, full_scan_detector, text):
+        """Test that the prefilter doesn't drop matches across unusual whitespace."""
+        expected = full_scan_detector.detect(text)
+
+        assert expected
+        assert configured_detector.detect(text) == expected
+
+    def test_prefilter_open_lower_bound_quantifier(self):
+        """Test that {,n} is read as {0,n} by every engine, prefilter included."""
+        patterns = [PIIPatternConfig(name="short_id", pii_type="ID", regex=r"ID\d{,3}X")]
+        detector = RegexDetector(patterns=patterns)
+
+        matches = detector.detect("ID12X ID1234X")
+
+        assert [m.text for m in matches] == ["ID12X"]
+
+    def test_untranslatable_pattern_is_not_prefiltered(self):
+        """Test that patterns Hyperscan would read differently always run on re."""
+        pytest.importorskip("hyperscan")
+        from api.detectors.regex import _HyperscanPrefilter
+
+        prefilter = _HyperscanPrefilter((r"[[:digit:]]+", r"ID\d+"))
+
+        assert prefilter.filtered_ids == {1}
+
+    def test_detectors_over_pattern_subsets_share_warmed_prefilter(self, server_config):
+        """Test that per-request pattern subsets reuse the startup prefilter instead of compiling."""
+        pytest.importorskip("hyperscan")
+        from api.detectors.regex import warm_prefilter, _warm_prefilters
+
+        enabled = [p for p in server_config.patterns if p.enabled]
+        regexes = tuple(p.regex for p in enabled)
+        warm_prefilter(regexes)
+        warmed, _ = _warm_prefilters[regexes]
+
+        for subset in (enabled, enabled[1:], enabled[::2]):
+            assert RegexDetector(patterns=subset)._prefilter is warmed
+
+    def test_re2_set_prefilter_does_not_change_matches(
+        self, monkeypatch, server_config, full_scan_detector, medical_form_original
+    ):
+        """Test that the RE2 set prefilter (no Hyperscan) finds exactly what a full scan finds."""
+        pytest.importorskip("re2")
+        from api.detectors import regex
+
+        # Without Hyperscan or a warmed prefilter, detectors fall back to an RE2 set
+        monkeypatch.setattr(regex, "hyperscan", None)
+        monkeypatch.setattr(regex, "_warm_prefilters", {})
+        regex._get_prefilter.cache_clear()
+        try:
+            detector = RegexDetector(patterns=server_config.patterns)
+        finally:
+            regex._get_prefilter.cache_clear()
+
+        text = medical_form_original
+        assert detector.detect(text) == full_scan_detector.detect(text)
+        assert detector.detect("") == []
+
 
 class TestReplacementMapper:
     """Tests for the replacement mapper."""
@@ -250,38 +348,26 @@ class TestMedicalFormAnonymization:
     """
 
     @pytest.fixture
-    def original_text(self):
+    def original_text(self, medical_form_original):
         """Load original medical form text."""
-        path = RESOURCES_PATH / "medical_form_original.txt"
-        if path.exists():
-            return path.read_text(encoding="utf-8")
-        pytest.skip("Test resource file not found")
+        return medical_form_original
 
     @pytest.fixture
-    def expected_text(self):
+    def expected_text(self, medical_form_anonymized):
         """Load expected anonymized text."""
-        path = RESOURCES_PATH / "medical_form_anonimyzed.txt"
-        if path.exists():
-            return path.read_text(encoding="utf-8")
-        pytest.skip("Test resource file not found")
+        return medical_form_anonymized
 
-    def test_detects_names_in_medical_form(self, original_text):
+    def test_detects_names_in_medical_form(self, configured_detector, original_text):
         """Test that names are detected in medical form."""
-        config = load_server_config()
-        detector = RegexDetector(patterns=config.patterns)
-
-        matches = detector.detect(original_text)
+        matches = configured_detector.detect(original_text)
         names = [m for m in matches if m.type == "NAME"]
 
         # Should detect multiple names
         assert len(names) > 0, "Should detect at least one name"
 
-    def test_detects_phone_in_medical_form(self, original_text):
+    def test_detects_phone_in_medical_form(self, configured_detector, original_text):
         """Test that phone numbers are detected in medical form."""
-        config = load_server_config()
-        detector = RegexDetector(patterns=config.patterns)
-
-        matches = detector.detect(original_text)
+        matches = configured_detector.detect(original_text)
         phones = [m for m in matches if m.type == "PHONE"]
 
         # Should detect phone number 058-6045454
@@ -289,25 +375,17 @@ class TestMedicalFormAnonymization:
         phone_texts = [p.text for p in phones]
         assert any("058" in p or "054" in p for p in phone_texts)
 
-    def test_detects_email_in_medical_form(self, original_text):
+    def test_detects_email_in_medical_form(self, configured_detector, original_text):
         """Test that email is detected in medical form."""
-        config = load_server_config()
-        detector = RegexDetector(patterns=config.patterns)
-
-        matches = detector.detect(original_text)
+        matches = configured_detector.detect(original_text)
         emails = [m for m in matches if m.type == "EMAIL"]
 
         # Should detect fmish2@gmail.com
         assert len(emails) > 0, "Should detect email"
         assert any("gmail" in e.text for e in emails)
 
-    def test_full_anonymization_pipeline(self, original_text):
+    def test_full_anonymization_pipeline(self, server_config, configured_detector, original_text):
         """Test complete anonymization pipeline."""
-        config = load_server_config()
-
-        # Create detector
-        detector = RegexDetector(patterns=config.patterns)
-
         # Create mapper with user-defined replacements (like in expected output)
         mapper = ReplacementMapper(
             user_mappings={
@@ -317,14 +395,14 @@ class TestMedicalFormAnonymization:
                 "מאור": "רמת גן",
                 "סיגלית": "הרצל",
             },
-            pools=config.replacement_pools,
+            pools=server_config.replacement_pools,
         )
 
         # Create obfuscator
         obfuscator = TextObfuscator(mapper=mapper)
 
         # Detect and obfuscate
-        matches = detector.detect(original_text)
+        matches = configured_detector.detect(original_text)
         result = obfuscator.obfuscate(original_text, matches)
 
         # Verify user-defined replacements were applied
@@ -349,21 +427,17 @@ class TestConfigLoading:
         assert config.replacement_pools is not None
         assert config.ocr is not None
 
-    def test_config_has_required_patterns(self):
+    def test_config_has_required_patterns(self, server_config):
         """Test that config has essential patterns."""
-        config = load_server_config()
-
-        pattern_names = {p.name for p in config.patterns}
+        pattern_names = {p.name for p in server_config.patterns}
 
         # Should have essential patterns
         assert "phone_mobile" in pattern_names or "phone" in pattern_names
         assert "email" in pattern_names
         assert "israeli_id" in pattern_names
 
-    def test_config_has_replacement_pools(self):
+    def test_config_has_replacement_pools(self, server_config):
         """Test that config has replacement pools."""
-        config = load_server_config()
-
-        assert len(config.replacement_pools.name_hebrew_first) > 0
-        assert len(config.replacement_pools.name_hebrew_last) > 0
-        assert len(config.replacement_pools.city) > 0
+        assert len(server_config.replacement_pools.name_hebrew_first) > 0
+        assert len(server_config.replacement_pools.name_hebrew_last) > 0
+        assert len(server_config.replacement_pools.city) > 0
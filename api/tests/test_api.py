@@ -3,16 +3,28 @@ API endpoint tests using FastAPI TestClient.
 """
 import pytest
 import json
+import fitz
 from pathlib import Path
 from fastapi.testclient import TestClient
 
 from api.main import app
+from api.processors.pdf import PDFProcessor
+from api.routes import processing
 
 
 # Path to test resources
 RESOURCES_PATH = Path(__file__).parent / "resources"
 
 
+@pytest.fixture(scope="module", autouse=True)
+def extraction_cache():
+    """Reuse extractions of the PDF every test here uploads again."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(processing, "extraction_cache_size", 8)
+        mp.setattr(processing, "_processors", {})
+        yield
+
+
 @pytest.fixture
 def client():
     """Create test client."""
@@ -163,6 +175,70 @@ class TestExtractEndpoint:
         assert download_response.status_code == 200
         assert download_response.headers["content-type"] == "application/pdf"
 
+    def test_extract_inline_returns_pdf(self, client, sample_pdf):
+        """Test that inline mode returns the PDF directly."""
+        response = client.post(
+            "/api/extract?inline=true",
+            files={"file": ("test.pdf", sample_pdf, "application/pdf")},
+            data={"config": "{}"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.content.startswith(b"%PDF")
+
+    def test_repeated_upload_is_extracted_once(self, client, monkeypatch):
+        """Test that re-uploading the same PDF reuses its extraction."""
+        doc = fitz.open()
+        doc.new_page().insert_text((50, 100), "Patient Johnson was seen again at the clinic for a follow-up.")
+        pdf_bytes = doc.tobytes()
+        doc.close()
+
+        extractions = []
+        real_extract = PDFProcessor._extract_text
+
+        def counting_extract(self, file, force_ocr):
+            extractions.append(force_ocr)
+            return real_extract(self, file, force_ocr)
+
+        monkeypatch.setattr(PDFProcessor, "_extract_text", counting_extract)
+        texts = []
+        for _ in range(2):
+            response = client.post(
+                "/api/extract",
+                files={"file": ("test.pdf", pdf_bytes, "application/pdf")},
+                data={"config": "{}"},
+            )
+            assert response.status_code == 200
+            texts.append(response.json()["obfuscated_text"])
+
+        assert len(extractions) == 1
+        assert texts[0] == texts[1]
+
+    def test_overlapping_matches_are_not_reported(self, client):
+        """Test that matches dropped by overlap resolution aren't reported or mapped."""
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((50, 100), "Patient Johnson was admitted to the ward for further observation.")
+        pdf_bytes = doc.tobytes()
+        doc.close()
+        config = {"user_replacements": {"Johnson": "Smith", "John": "Paul"}}
+
+        response = client.post(
+            "/api/extract",
+            files={"file": ("test.pdf", pdf_bytes, "application/pdf")},
+            data={"config": json.dumps(config)},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "Patient Smith was admitted" in data["obfuscated_text"]
+        assert data["mappings_used"].get("Johnson") == "Smith"
+        assert "John" not in data["mappings_used"]
+        reported = [m["text"] for page in data["pages"] for m in page["matches"]]
+        assert "John" not in reported
+        assert data["total_matches"] == len(reported)
+
     def test_download_nonexistent_file(self, client):
         """Test downloading non-existent file returns 404."""
         response = client.get("/api/download/nonexistent123")
@@ -215,3 +291,22 @@ class TestExtractResponse:
                 assert "end" in match
                 assert "pattern_name" in match
                 assert "replacement" in match
+
+
+class TestExtractPlainEndpoint:
+    """Tests for plain text extraction endpoint."""
+
+    def test_overlapping_user_terms_report_only_replaced(self, client):
+        """Test that a term swallowed by a longer overlapping one isn't reported."""
+        config = {"user_replacements": {"סיגלית": "הרצל", "גל": "ים"}}
+
+        response = client.post(
+            "/api/extract/plain",
+            json={"text": "שלום סיגלית", "config": config},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["obfuscated_text"] == "שלום הרצל"
+        assert data["mappings_used"] == {"סיגלית": "הרצל"}
+        assert data["total_matches"] == 1
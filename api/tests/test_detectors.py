@@ -3,6 +3,7 @@ from api.detectors.israeli_id import IsraeliIdDetector
 from api.detectors.hebrew_name import HebrewNameDetector
 from api.detectors.english_name import EnglishNameDetector
 from api.detectors.user_defined import UserDefinedDetector
+from api.detectors.category import CategoryDetector
 
 
 class TestIsraeliIdDetector:
@@ -104,6 +105,32 @@ class TestEnglishNameDetector:
         assert len(matches) == 1
         assert matches[0].text == "John Smith"
 
+    def test_long_name_run_is_not_truncated(self, monkeypatch):
+        # The possessive name run stays linear on long adversarial lines,
+        # so it needs no length cap that would leave the tail unredacted
+        scans = []
+        pattern = EnglishNameDetector.PATTERN
+
+        class CountingPattern:
+            def finditer(self, text):
+                for match in pattern.finditer(text):
+                    scans.append(match.span())
+                    yield match
+
+        monkeypatch.setattr(EnglishNameDetector, "PATTERN", CountingPattern())
+        name = "ab " * 20000
+        matches = self.detector.detect(f"Name: {name}1")
+        assert len(matches) == 1
+        assert matches[0].text == name.strip()
+        # One match for the whole run, not one per chunk of it
+        assert scans == [(0, len("Name: ") + len(name))]
+
+    def test_iter_matches_is_lazy(self):
+        text = "Name: John Smith\nSurname: Johnson"
+        matches = self.detector.iter_matches(text)
+        assert next(matches).text == "John Smith"
+        assert [m.text for m in matches] == ["Johnson"]
+
 
 class TestUserDefinedDetector:
     def test_single_term(self):
@@ -139,3 +166,32 @@ class TestUserDefinedDetector:
         text = "Some text"
         matches = detector.detect(text)
         assert len(matches) == 0
+
+
+class TestCategoryDetector:
+    def test_hebrew_word_boundaries(self):
+        detector = CategoryDetector(categories={"unit": ["גולני"]})
+        text = "שירת בגולני ובחטיבת גולני"
+        matches = detector.detect(text)
+        assert len(matches) == 1
+        assert matches[0].text == "גולני"
+        assert matches[0].pattern_name == "category:unit"
+
+    def test_number_word_boundaries(self):
+        detector = CategoryDetector(categories={"unit": ["8200"]})
+        text = "יחידה 8200, not 82001"
+        matches = detector.detect(text)
+        assert len(matches) == 1
+        assert matches[0].start == text.index("8200")
+
+    def test_same_span_reported_once(self):
+        detector = CategoryDetector(categories={"a": ["401"], "b": ["401"]})
+        matches = detector.detect("unit 401")
+        assert len(matches) == 1
+        assert matches[0].pattern_name == "category:a"
+
+    def test_word_added_after_init(self):
+        detector = CategoryDetector(categories={})
+        assert detector.detect("unit 401") == []
+        detector.add_word("unit", "401")
+        assert len(detector.detect("unit 401")) == 1
@@ -5,210 +5,189 @@ These tests verify:
 1. Anonymization with replacements from config replaces all PII
 2. All tests are data-driven - no hardcoded assumptions about content
 """
-import re
+import ahocorasick
 import pytest
-from pathlib import Path
+from collections.abc import Mapping
+from functools import lru_cache
 
-from api.config import load_server_config
 from api.detectors.user_defined import UserDefinedDetector
 from api.obfuscators.text import TextObfuscator
 from api.replacements.mapper import ReplacementMapper
 
 
-# Path to test resources
-RESOURCES_DIR = Path(__file__).parent / "resources"
+# Hebrew block plus apostrophe (geresh), deleted by str.translate
+_HEB_TABLE = dict.fromkeys(range(0x0590, 0x0600))
+_HEB_TABLE[ord("'")] = None
 
 
-def get_replacements_from_config() -> dict[str, str]:
-    """Load default replacements from server config."""
-    config = load_server_config()
-    return config.default_replacements
+@lru_cache(maxsize=1024)
+def is_hebrew_only(term: str) -> bool:
+    """Check if term is purely Hebrew (needs word boundaries to avoid breaking words)."""
+    return not term.translate(_HEB_TABLE)
 
 
-def apply_replacements(text: str, replacements: dict[str, str]) -> str:
-    """Apply find-and-replace using replacements dict with word boundary support."""
-    # Sort by length descending to replace longer strings first
-    sorted_items = sorted(replacements.items(), key=lambda x: len(x[0]), reverse=True)
+def is_hebrew_letter(char: str) -> bool:
+    """Check if char is a Hebrew letter (א-ת)."""
+    return 'א' <= char <= 'ת'
 
-    result = text
-    for original, replacement in sorted_items:
-        # Check if the term is purely Hebrew (needs word boundaries to avoid breaking words)
-        is_hebrew_only = all('\u0590' <= c <= '\u05FF' or c in "'" for c in original)
 
-        if is_hebrew_only:
-            # For Hebrew words: don't match if surrounded by Hebrew letters
-            pattern = r'(?<![א-ת])' + re.escape(original) + r'(?![א-ת])'
-            result = re.sub(pattern, replacement, result)
-        else:
-            # For numbers, emails, mixed content: simple replacement
-            result = result.replace(original, replacement)
+@lru_cache(maxsize=8)
+def build_replacement_automaton(items: tuple[tuple[str, str], ...]) -> ahocorasick.Automaton:
+    """Build the Aho-Corasick automaton for a replacements set (reused across calls)."""
+    automaton = ahocorasick.Automaton()
+    for original, replacement in items:
+        automaton.add_word(original, (len(original), replacement, is_hebrew_only(original)))
+    automaton.make_automaton()
+    return automaton
 
-    return result
 
+@lru_cache(maxsize=8)
+def build_substring_automaton(terms: frozenset[str]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton reporting each term as its own value."""
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
 
-def has_standalone_match(text: str, term: str) -> bool:
-    """Check if term appears as standalone (not part of larger Hebrew word)."""
-    is_hebrew_only = all('\u0590' <= c <= '\u05FF' or c in "'" for c in term)
-    if is_hebrew_only:
-        pattern = r'(?<![א-ת])' + re.escape(term) + r'(?![א-ת])'
-        return bool(re.search(pattern, text))
-    else:
-        return term in text
 
+def find_substrings(text: str, terms: frozenset[str]) -> set[str]:
+    """Return the terms that occur anywhere in text, in one pass."""
+    if not terms:
+        return set()
+    return {term for _, term in build_substring_automaton(terms).iter(text)}
 
-class TestAnonymizationE2E:
+
+def iter_standalone_hits(text: str, replacements: Mapping[str, str]):
     """
-    End-to-end anonymization tests.
+    Yield (start, end, replacement) for every standalone occurrence of a
+    replacement key in text, found in one Aho-Corasick pass.
 
-    These tests verify that applying the configured replacements:
-    1. Removes all original PII values from text
-    2. Replaces them with the configured replacement values
+    Hebrew-only keys must not touch a Hebrew letter on either side; other
+    keys match anywhere. Overlapping occurrences are all reported.
     """
+    automaton = build_replacement_automaton(tuple(replacements.items()))
+    for end_index, (length, replacement, needs_boundary) in automaton.iter(text):
+        start, end = end_index - length + 1, end_index + 1
+        if needs_boundary and (
+            (start > 0 and is_hebrew_letter(text[start - 1]))
+            or (end < len(text) and is_hebrew_letter(text[end]))
+        ):
+            continue
+        yield start, end, replacement
 
-    def test_medical_form_anonymization(self):
-        """
-        Test: original text + replacements removes all PII
 
-        Verifies all original PII is replaced with configured values.
-        """
-        original_path = RESOURCES_DIR / "medical_form_original.txt"
+def find_standalone_terms(text: str, replacements: Mapping[str, str]) -> set[str]:
+    """Return the replacement keys that appear standalone in text (one pass)."""
+    if not replacements:
+        return set()
+    return {text[start:end] for start, end, _ in iter_standalone_hits(text, replacements)}
 
-        if not original_path.exists():
-            pytest.skip("Test resource file not found")
 
-        # Load original text
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
+def apply_replacements(text: str, replacements: Mapping[str, str]) -> str:
+    """
+    Apply find-and-replace using replacements dict with word boundary support.
 
-        # Get replacements from config
-        replacements = get_replacements_from_config()
+    All terms are found in one Aho-Corasick pass; at each position the
+    longest standalone term wins, and the output is spliced in one join.
+    """
+    if not replacements:
+        return text
 
-        # Apply replacements
-        anonymized_text = apply_replacements(original_text, replacements)
+    # Leftmost match first, longest first among matches at the same position
+    hits = sorted(
+        (start, start - end, replacement)
+        for start, end, replacement in iter_standalone_hits(text, replacements)
+    )
 
-        # Verify: original PII values should NOT appear as standalone in output
-        for original, replacement in replacements.items():
-            # Skip short values that might be substrings of other words
-            if len(original) >= 4:
-                assert not has_standalone_match(anonymized_text, original), \
-                    f"Original PII '{original}' should be replaced with '{replacement}'"
+    parts = []
+    cursor = 0
+    for start, negative_length, replacement in hits:
+        if start < cursor:
+            continue
+        parts.append(text[cursor:start])
+        parts.append(replacement)
+        cursor = start - negative_length
+    parts.append(text[cursor:])
 
-        # Verify: replacement values SHOULD be in output (for values that existed in original)
-        for original, replacement in replacements.items():
-            if has_standalone_match(original_text, original) and len(replacement) >= 4:
-                assert replacement in anonymized_text, \
-                    f"Replacement '{replacement}' should appear in anonymized text"
+    return "".join(parts)
+
+
+class TestAnonymizationE2E:
+    """
+    End-to-end anonymization tests.
 
-    def test_medical_summary_anonymization(self):
+    These tests verify that applying the configured replacements:
+    1. Removes all original PII values from text
+    2. Replaces them with the configured replacement values
+    """
+
+    @pytest.mark.parametrize("resource", ["medical_form_original", "medical_summary_original"])
+    def test_anonymization(self, request, resource, default_replacements):
         """
         Test: original text + replacements removes all PII
 
         Verifies all original PII is replaced with configured values.
         """
-        original_path = RESOURCES_DIR / "medical_summary_original.txt"
-
-        if not original_path.exists():
-            pytest.skip("Test resource file not found")
-
-        # Load original text
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
+        original_text = request.getfixturevalue(resource)
 
-        # Get replacements from config
-        replacements = get_replacements_from_config()
+        # Replacements from config
+        replacements = default_replacements
 
         # Apply replacements
         anonymized_text = apply_replacements(original_text, replacements)
 
         # Verify: original PII values should NOT appear as standalone in output
+        # (one scan of the output finds every leaked value)
+        leaked = find_standalone_terms(anonymized_text, replacements)
         for original, replacement in replacements.items():
             # Skip short values that might be substrings of other words
             if len(original) >= 4:
-                assert not has_standalone_match(anonymized_text, original), \
+                assert original not in leaked, \
                     f"Original PII '{original}' should be replaced with '{replacement}'"
 
         # Verify: replacement values SHOULD be in output (for values that existed in original)
-        for original, replacement in replacements.items():
-            if has_standalone_match(original_text, original) and len(replacement) >= 4:
-                assert replacement in anonymized_text, \
+        # (one scan of each text finds the present originals and replacements)
+        present_originals = find_standalone_terms(original_text, replacements)
+        present_replacements = find_substrings(anonymized_text, frozenset(replacements.values()))
+        for original in present_originals:
+            replacement = replacements[original]
+            if len(replacement) >= 4:
+                assert replacement in present_replacements, \
                     f"Replacement '{replacement}' should appear in anonymized text"
 
 
+@pytest.fixture(scope="module")
+def replacements_detector(default_replacements):
+    """UserDefinedDetector over the config replacements (read-only, shared)."""
+    user_terms = [
+        {"text": original, "type": "USER_DEFINED"}
+        for original in default_replacements.keys()
+    ]
+    return UserDefinedDetector(terms=user_terms)
+
+
 class TestPipelineE2E:
     """
     Test the full detection + replacement pipeline using API components.
     """
 
-    def test_medical_form_pipeline(self):
+    @pytest.mark.parametrize("resource", ["medical_form_original", "medical_summary_original"])
+    def test_pipeline(self, request, resource, default_replacements, replacements_detector):
         """
         Test full pipeline: detect user-defined terms + replace
 
         Uses _original.txt file and config replacements.
         """
-        original_path = RESOURCES_DIR / "medical_form_original.txt"
-
-        if not original_path.exists():
-            pytest.skip("Test resource file not found")
+        original_text = request.getfixturevalue(resource)
 
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
+        # Replacements from config
+        replacements = default_replacements
 
-        # Get replacements from config
-        replacements = get_replacements_from_config()
+        # User-defined detector over the replacements (built once per module)
+        detector = replacements_detector
 
-        # Create user-defined detector from replacements
-        user_terms = [
-            {"text": original, "type": "USER_DEFINED"}
-            for original in replacements.keys()
-        ]
-        detector = UserDefinedDetector(terms=user_terms)
-
-        # Create mapper with replacements
-        mapper = ReplacementMapper(
-            user_mappings=replacements,
-            pools={},
-        )
-
-        # Create obfuscator
-        obfuscator = TextObfuscator(mapper=mapper)
-
-        # Detect matches
-        matches = detector.detect(original_text)
-
-        # Verify matches were found
-        assert len(matches) > 0, "Should detect PII matches"
-
-        # Obfuscate
-        anonymized = obfuscator.obfuscate(original_text, matches)
-
-        # Verify text was changed
-        assert anonymized != original_text, "Text should be modified after obfuscation"
-
-    def test_medical_summary_pipeline(self):
-        """
-        Test full pipeline: detect user-defined terms + replace
-
-        Uses _original.txt file and config replacements.
-        """
-        original_path = RESOURCES_DIR / "medical_summary_original.txt"
-
-        if not original_path.exists():
-            pytest.skip("Test resource file not found")
-
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
-
-        # Get replacements from config
-        replacements = get_replacements_from_config()
-
-        # Create user-defined detector from replacements
-        user_terms = [
-            {"text": original, "type": "USER_DEFINED"}
-            for original in replacements.keys()
-        ]
-        detector = UserDefinedDetector(terms=user_terms)
-
-        # Create mapper with replacements
+        # Create mapper with replacements (fresh per test, it tracks usage)
         mapper = ReplacementMapper(
             user_mappings=replacements,
             pools={},
@@ -237,46 +216,28 @@ class TestDirectComparison:
     These are the strictest tests - output must exactly match expected files.
     """
 
-    def test_medical_form_matches_expected(self):
+    def test_medical_form_matches_expected(self, medical_form_original, medical_form_anonymized, default_replacements):
         """
         Direct comparison: original + replacements should equal _anonymized.txt
         """
-        original_path = RESOURCES_DIR / "medical_form_original.txt"
-        expected_path = RESOURCES_DIR / "medical_form_anonimyzed.txt"
-
-        if not original_path.exists() or not expected_path.exists():
-            pytest.skip("Test resource files not found")
-
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
+        original_text = medical_form_original
+        expected_text = medical_form_anonymized
 
-        with open(expected_path, "r", encoding="utf-8") as f:
-            expected_text = f.read()
-
-        replacements = get_replacements_from_config()
+        replacements = default_replacements
         actual_text = apply_replacements(original_text, replacements)
 
         # Direct comparison
         assert actual_text == expected_text, \
             f"Output doesn't match expected _anonymized.txt file"
 
-    def test_medical_summary_matches_expected(self):
+    def test_medical_summary_matches_expected(self, medical_summary_original, medical_summary_anonymized, default_replacements):
         """
         Direct comparison: original + replacements should equal _anonymized.txt
         """
-        original_path = RESOURCES_DIR / "medical_summary_original.txt"
-        expected_path = RESOURCES_DIR / "medical_summary_anonymized.txt"
-
-        if not original_path.exists() or not expected_path.exists():
-            pytest.skip("Test resource files not found")
-
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
-
-        with open(expected_path, "r", encoding="utf-8") as f:
-            expected_text = f.read()
+        original_text = medical_summary_original
+        expected_text = medical_summary_anonymized
 
-        replacements = get_replacements_from_config()
+        replacements = default_replacements
         actual_text = apply_replacements(original_text, replacements)
 
         # Direct comparison
@@ -287,15 +248,14 @@ class TestDirectComparison:
 class TestConfigReplacements:
     """Verify config has replacements loaded correctly."""
 
-    def test_config_has_default_replacements(self):
+    def test_config_has_default_replacements(self, server_config):
         """Config should have default_replacements populated."""
-        config = load_server_config()
-        assert hasattr(config, 'default_replacements'), "Config should have default_replacements"
-        assert len(config.default_replacements) > 0, "default_replacements should not be empty"
+        assert hasattr(server_config, 'default_replacements'), "Config should have default_replacements"
+        assert len(server_config.default_replacements) > 0, "default_replacements should not be empty"
 
-    def test_replacements_have_both_keys_and_values(self):
+    def test_replacements_have_both_keys_and_values(self, default_replacements):
         """Each replacement should have non-empty key and value."""
-        replacements = get_replacements_from_config()
+        replacements = default_replacements
         for key, value in replacements.items():
             assert key, "Replacement key should not be empty"
             assert value, "Replacement value should not be empty"
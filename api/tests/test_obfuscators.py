@@ -1,11 +1,14 @@
 import pytest
 from api.obfuscators.text import TextObfuscator
 from api.detectors.base import PIIMatch
+from api.replacements.mapper import ReplacementMapper
 
 
 class TestTextObfuscator:
-    def setup_method(self):
-        self.obfuscator = TextObfuscator()
+    @classmethod
+    def setup_class(cls):
+        # One instance for the whole class (stateless without a mapper)
+        cls.obfuscator = TextObfuscator()
 
     def test_obfuscate_name(self):
         text = "Hello John"
@@ -36,11 +39,59 @@ class TestTextObfuscator:
         result = self.obfuscator.obfuscate(text, matches)
         assert result == "Start [NAME] End"
 
+    def test_overlapping_matches_keep_longer(self):
+        text = "Dear Johnson Smith"
+        matches = [
+            PIIMatch(text="John", type="NAME", start=5, end=9),
+            PIIMatch(text="Johnson Smith", type="USER_DEFINED", start=5, end=18),
+            PIIMatch(text="son Smith", type="NAME", start=9, end=18),
+        ]
+        result = self.obfuscator.obfuscate(text, matches)
+        assert result == "Dear [REDACTED]"
+
+    def test_overlapping_matches_equal_length_use_priority(self):
+        text = "Ref 123456789"
+        matches = [
+            PIIMatch(text="123456789", type="USER_DEFINED", start=4, end=13),
+            PIIMatch(text="123456789", type="ID", start=4, end=13),
+        ]
+        result = self.obfuscator.obfuscate(text, matches)
+        assert result == "Ref [ID]"
+
+    def test_partial_overlap_redacts_union(self):
+        text = "Ref 0123456789 end"
+        matches = [
+            PIIMatch(text="0123456", type="USER_DEFINED", start=4, end=11),
+            PIIMatch(text="23456789", type="ID", start=6, end=14),
+        ]
+        kept = self.obfuscator.resolve_overlaps(matches)
+        assert [(m.text, m.type, m.start, m.end) for m in kept] == [
+            ("0123456789", "ID", 4, 14),
+        ]
+        assert self.obfuscator.obfuscate(text, matches) == "Ref [ID] end"
+
+    def test_partial_overlap_chain_merges(self):
+        text = "aaaa bbbb cccc"
+        matches = [
+            PIIMatch(text="aaaa b", type="NAME", start=0, end=6),
+            PIIMatch(text="bbbb c", type="NAME", start=5, end=11),
+            PIIMatch(text="cccc", type="NAME", start=10, end=14),
+        ]
+        kept = self.obfuscator.resolve_overlaps(matches)
+        assert [(m.text, m.start, m.end) for m in kept] == [(text, 0, 14)]
+
     def test_no_matches(self):
         text = "No PII here"
         result = self.obfuscator.obfuscate(text, [])
         assert result == "No PII here"
 
+    def test_no_matches_leaves_mapper_unused(self):
+        mapper = ReplacementMapper(user_mappings={"John": "David"})
+        obfuscator = TextObfuscator(mapper=mapper)
+        text = "No PII here"
+        assert obfuscator.obfuscate(text, []) is text
+        assert len(mapper.get_all_mappings()) == 0
+
     def test_custom_placeholder(self):
         custom_map = {"NAME": "***", "ID": "###"}
         obfuscator = TextObfuscator(placeholder_map=custom_map)
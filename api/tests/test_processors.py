@@ -1,11 +1,15 @@
+import mmap
 import pytest
+import pdfplumber
 import fitz
+from functools import lru_cache
 from api.processors.pdf import PDFProcessor
 from api.processors.base import ProcessedPage
 
 
+@lru_cache(maxsize=None)
 def create_test_pdf(text: str) -> bytes:
-    """Create a simple PDF with the given text."""
+    """Create a simple PDF with the given text (memoized; bytes are immutable)."""
     doc = fitz.open()
     page = doc.new_page()
     page.insert_text((50, 100), text)
@@ -19,8 +23,10 @@ LONG_TEST_TEXT = "Hello World - This is a test PDF with enough text to pass the
 
 
 class TestPDFProcessor:
-    def setup_method(self):
-        self.processor = PDFProcessor()
+    @classmethod
+    def setup_class(cls):
+        # One instance for the whole class (keeps no per-call state; the OCR reader loads once)
+        cls.processor = PDFProcessor()
 
     def test_supported_mimes(self):
         assert "application/pdf" in self.processor.supported_mimes
@@ -52,6 +58,34 @@ class TestPDFProcessor:
         assert "width" in pages[0].metadata
         assert "height" in pages[0].metadata
 
+    def test_extraction_cache(self, monkeypatch):
+        processor = PDFProcessor(cache_size=1)
+        pdf_bytes = create_test_pdf(LONG_TEST_TEXT)
+        first = processor.extract_text(pdf_bytes)
+        first[0].metadata["width"] = -1
+
+        # A repeat of the same bytes is served from the cache, unmodified
+        monkeypatch.setattr(processor, "_extract_with_pymupdf", None)
+        second = processor.extract_text(pdf_bytes)
+        assert second[0].text == first[0].text
+        assert second[0].metadata["width"] > 0
+
+    def test_extract_text_from_path_hands_pdfplumber_the_mapping(self, tmp_path, monkeypatch):
+        pdf_path = tmp_path / "test.pdf"
+        pdf_path.write_bytes(create_test_pdf(LONG_TEST_TEXT))
+
+        streams = []
+        real_open = pdfplumber.open
+
+        def recording_open(stream):
+            streams.append(type(stream))
+            return real_open(stream)
+
+        monkeypatch.setattr(pdfplumber, "open", recording_open)
+        pages = self.processor.extract_text_from_path(pdf_path)
+        assert "Hello World" in pages[0].text
+        assert streams == [mmap.mmap]
+
     def test_reassemble(self):
         processed_pages = [
             ProcessedPage(
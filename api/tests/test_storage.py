@@ -0,0 +1,37 @@
+import time
+
+from api.storage import temp
+from api.storage.temp import TempFileStorage
+
+
+def test_expired_files_are_removed(tmp_path, monkeypatch):
+    """Files are removed once their TTL passes, without a directory scan."""
+    monkeypatch.setattr(temp, "FILE_TTL", 0.2)
+    storage = TempFileStorage(str(tmp_path))
+
+    kept_id = storage.save(b"kept")
+    deleted_id = storage.save(b"deleted")
+    assert storage.delete(deleted_id)
+
+    deadline = time.time() + 5
+    while storage.get(kept_id) is not None and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert storage.get(kept_id) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_leftover_files_are_scheduled(tmp_path, monkeypatch):
+    """Files from a previous run expire based on their modification time."""
+    monkeypatch.setattr(temp, "FILE_TTL", 0)
+    leftover = tmp_path / "leftover.pdf"
+    leftover.write_bytes(b"old")
+
+    storage = TempFileStorage(str(tmp_path))
+
+    deadline = time.time() + 5
+    while leftover.exists() and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert not leftover.exists()
+    assert storage._expiry == []